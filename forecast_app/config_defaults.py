@@ -0,0 +1,28 @@
+# config_defaults.py  –  GENERATED by config_loader.write_defaults_module(), do not edit
+# Pre-parsed default config.toml, so an untouched user copy needs no TOML parsing.
+
+DEFAULT_SHA256 = '63b7dea8655156fe9074fcf771394c5c7a47578a41dd30feac89d9c82d256f98'
+
+DEFAULTS = {'app': {'log_dir': 'MountainForecastLogs'},
+ 'ui': {'style': 'filled'},
+ 'forecast': {'constants': {'dew_spread_threshold': 2.0, 'min_samples_for_forecast': 2}},
+ 'ml': {'enabled': False,
+        'model_path': 'models/naive.joblib',
+        'desc': 'Toggle/use ML-based trend; if disabled, use heuristic.',
+        'params': {'window_minutes': 30, 'min_points': 6}},
+ 'descriptions': {'forecast': {'constants': {'dew_spread_threshold': 'Minimum widening (°C) to '
+                                                                     'signal BETTER',
+                                             'min_samples_for_forecast': 'Minimum readings before '
+                                                                         'showing a trend'}}},
+ 'atmosphere': {'T0': {'value': 288.15,
+                       'unit': 'K',
+                       'desc': 'Reference temperature at sea level (0 km).'},
+                'L0': {'value': -6.5,
+                       'unit': 'K/km',
+                       'desc': 'Temperature lapse rate in the troposphere.'},
+                'P0': {'value': 101325, 'unit': 'Pa', 'desc': 'Reference pressure at sea level.'},
+                'R': {'value': 8314.32,
+                      'unit': 'N·m/(kmol·K)',
+                      'desc': 'Universal gas constant (per kmol).'},
+                'M0': {'value': 28.9644, 'unit': 'kg/kmol', 'desc': 'Molar mass of dry air.'},
+                'H0': {'value': 0.0, 'unit': 'km', 'desc': 'Reference geopotential height.'}}}
@@ -1,6 +1,10 @@
 # config_loader.py  –  TOML config for Python 3.10 (Pyto)
 from __future__ import annotations
 from pathlib import Path
+from functools import lru_cache, cache
+from dataclasses import dataclass
+from types import SimpleNamespace
+import hashlib
 import io
 
 # Try stdlib tomllib (3.11+) then fall back to tomli (vendor it if needed)
@@ -9,85 +13,87 @@ try:                                     # Py 3.11+
 except Exception:                        # Py 3.10 → needs tomli
     import tomli as _toml                # pip install tomli, or vendor tomli.py
 
-CONFIG_DIR = Path.home() / "Documents" / "MountainForecastConfig"
+# Pre-parsed default config.toml (generated, see write_defaults_module below)
+from forecast_app.config_defaults import DEFAULTS, DEFAULT_SHA256
+
+@cache
+def _docs() -> Path:
+    """~/Documents, resolved once per process (Path.home() hits env/pwd)."""
+    return Path.home() / "Documents"
+
+CONFIG_DIR = _docs() / "MountainForecastConfig"
 CONFIG_FILE = CONFIG_DIR / "config.toml"
 
-_DEFAULT_TOML = """\
-[app]
-# Where logs are written (relative paths resolved under ~/Documents)
-log_dir = "MountainForecastLogs"
-
-[forecast.constants]
-dew_spread_threshold = 2.0              # °C widening to call BETTER
-min_samples_for_forecast = 2            # Require at least 2 readings
-
-[ml]
-enabled = false
-model_path = "models/naive.joblib"      # Example; not required for Pyto
-desc = "Toggle/use ML-based trend; if disabled, use heuristic."
-
-[ml.params]
-window_minutes = 30
-min_points = 6
-
-# Optional: central place for displayable descriptions of simple keys
-[descriptions.forecast.constants]
-dew_spread_threshold = "Minimum widening (°C) to signal BETTER"
-min_samples_for_forecast = "Minimum readings before showing a trend"
-
-# -------------------------------------------------------------------
-# U.S. Standard Atmosphere (troposphere) constants
-# Units are explicit; convert as needed in code.
-# -------------------------------------------------------------------
-[atmosphere.T0]
-value = 288.15
-unit  = "K"
-desc  = "Reference temperature at sea level (0 km)."
-
-[atmosphere.L0]
-value = -6.5
-unit  = "K/km"
-desc  = "Temperature lapse rate in the troposphere."
-
-[atmosphere.P0]
-value = 101325
-unit  = "Pa"
-desc  = "Reference pressure at sea level."
-
-[atmosphere.R]
-value = 8.31432e3
-unit  = "N·m/(kmol·K)"
-desc  = "Universal gas constant (per kmol)."
-
-[atmosphere.M0]
-value = 28.9644
-unit  = "kg/kmol"
-desc  = "Molar mass of dry air."
-
-[atmosphere.H0]
-value = 0.0
-unit  = "km"
-desc  = "Reference geopotential height."
-"""
+def _default_toml() -> str:
+    """
+    Text of the default config: the config.toml shipped next to this module.
+    Read only when it's needed (first run, regenerating config_defaults.py),
+    so the template isn't a constant loaded on every import.
+    """
+    return Path(__file__).with_name("config.toml").read_text(encoding="utf-8")
 
 def ensure_exists() -> None:
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     if not CONFIG_FILE.exists():
-        CONFIG_FILE.write_text(_DEFAULT_TOML, encoding="utf-8")
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        CONFIG_FILE.write_text(_default_toml(), encoding="utf-8")
 
-def load_config() -> dict:
+def _merged(base: dict, over: dict) -> dict:
+    """
+    Deep-merge: values from `over` win, missing keys come from `base`.
+    Where `base` has a table, a non-table in `over` (e.g. a hand-edited
+    `ui = "plain"`) is ignored, so cfg.ui.style still resolves.
+    """
+    out = dict(base)
+    for k, v in over.items():
+        b = out.get(k)
+        if isinstance(b, dict):
+            if not isinstance(v, dict):
+                continue                 # keep the default table
+            v = _merged(b, v)
+        out[k] = v
+    return out
+
+def _to_ns(d: dict) -> SimpleNamespace:
+    return SimpleNamespace(**{k: _to_ns(v) if isinstance(v, dict) else v for k, v in d.items()})
+
+def _sha256(data: bytes) -> str:
+    # ignore CRLF vs LF so a file saved on Windows still matches the defaults
+    return hashlib.sha256(data.replace(b"\r\n", b"\n")).hexdigest()
+
+@lru_cache(maxsize=1)
+def _load(mtime_ns: int) -> SimpleNamespace:
+    # mtime_ns is only the cache key: an edited file gets re-parsed
+    data = CONFIG_FILE.read_bytes()
+    if _sha256(data) == DEFAULT_SHA256:
+        cfg = DEFAULTS                   # untouched file: skip TOML parsing
+    else:
+        cfg = _merged(DEFAULTS, _toml.loads(data.decode("utf-8")))
+    return _to_ns(cfg)
+
+def load_config() -> SimpleNamespace:
     """
-    Returns a nested dict from config.toml.
+    Returns config.toml as a SimpleNamespace tree, so known keys are plain
+    attribute access: cfg.forecast.constants.dew_spread_threshold.
+    Keys missing from the file fall back to the shipped defaults.
     If the file doesn't exist, writes defaults first.
+    The parsed result is cached until the file's mtime changes.
+    """
+    try:
+        mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        ensure_exists()
+        mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+    return _load(mtime_ns)
+
+def get(d, dotted: str, default=None):
+    """
+    Get nested value by dotted path, e.g. 'forecast.constants.dew_spread_threshold'.
+    Works on the namespace from load_config() as well as on plain dicts.
     """
-    ensure_exists()
-    with CONFIG_FILE.open("rb") as f:
-        return _toml.load(f)
-
-def get(d: dict, dotted: str, default=None):
-    """Get nested value by dotted path, e.g. 'forecast.constants.dew_spread_threshold'."""
     cur = d
     for part in dotted.split("."):
+        if isinstance(cur, SimpleNamespace):
+            cur = vars(cur)
         if not isinstance(cur, dict) or part not in cur:
             return default
         cur = cur[part]
@@ -95,16 +101,54 @@ def get(d: dict, dotted: str, default=None):
 
 def path_in_docs(*parts: str) -> Path:
     """Resolve a path under ~/Documents (useful for model files, logs)."""
-    return Path.home() / "Documents" / Path(*parts)
-
-def atmosphere_constants_SI(cfg: dict) -> dict:
-    atm = cfg.get("atmosphere", {})
-    def v(k, d): return float(atm.get(k, {}).get("value", d))
-    T0_K = v("T0", 288.15)
-    L0_K_per_m = v("L0", -6.5) / 1000.0          # K/km → K/m
-    P0_Pa = v("P0", 101325.0)
-    R_J_per_molK = v("R", 8.31432e3) / 1000.0    # per kmol → per mol
-    M0_kg_per_mol = v("M0", 28.9644) / 1000.0    # per kmol → per mol
-    H0_m = v("H0", 0.0) * 1000.0                 # km → m
-    return dict(T0_K=T0_K, L0_K_per_m=L0_K_per_m, P0_Pa=P0_Pa,
-                R_J_per_molK=R_J_per_molK, M0_kg_per_mol=M0_kg_per_mol, H0_m=H0_m)
+    return _docs() / Path(*parts)
+
+@dataclass(frozen=True, slots=True)
+class Atmosphere:
+    """[atmosphere] constants already converted to SI units."""
+    T0_K: float
+    L0_K_per_m: float
+    P0_Pa: float
+    R_J_per_molK: float
+    M0_kg_per_mol: float
+    H0_m: float
+
+_atm_cache: tuple = (None, None)        # (cfg it was built from, Atmosphere)
+
+def atmosphere_constants_SI(cfg) -> Atmosphere:
+    """Build once per loaded config; later calls with the same cfg reuse it."""
+    global _atm_cache
+    if _atm_cache[0] is cfg:
+        return _atm_cache[1]
+    atm = get(cfg, "atmosphere", {})
+    def v(k, d): return float(get(atm, k + ".value", d))
+    result = Atmosphere(
+        T0_K=v("T0", 288.15),
+        L0_K_per_m=v("L0", -6.5) / 1000.0,          # K/km → K/m
+        P0_Pa=v("P0", 101325.0),
+        R_J_per_molK=v("R", 8.31432e3) / 1000.0,    # per kmol → per mol
+        M0_kg_per_mol=v("M0", 28.9644) / 1000.0,    # per kmol → per mol
+        H0_m=v("H0", 0.0) * 1000.0,                 # km → m
+    )
+    _atm_cache = (cfg, result)
+    return result
+
+def write_defaults_module() -> Path:
+    """
+    Regenerate config_defaults.py from the shipped config.toml.
+    Run after editing config.toml:  python -m forecast_app.config_loader
+    """
+    import pprint
+    text = _default_toml()
+    target = Path(__file__).with_name("config_defaults.py")
+    target.write_text(
+        "# config_defaults.py  –  GENERATED by config_loader.write_defaults_module(), do not edit\n"
+        "# Pre-parsed default config.toml, so an untouched user copy needs no TOML parsing.\n\n"
+        f"DEFAULT_SHA256 = {_sha256(text.encode('utf-8'))!r}\n\n"
+        f"DEFAULTS = {pprint.pformat(_toml.loads(text), width=100, sort_dicts=False)}\n",
+        encoding="utf-8",
+    )
+    return target
+
+if __name__ == "__main__":
+    print("wrote", write_defaults_module())
@@ -1,13 +1,42 @@
 # Pure algorithm: session -> "BETTER" | "STABLE" | "WORSE" (or "NEED MORE DATA")
 
+from array import array
+
+CODES = ("WORSE", "STABLE", "BETTER")   # indexed by classify_code(...) + 1
+
+def classify_code(delta, thr=2.0):
+    """Trend code: -1 WORSE, 0 STABLE, 1 BETTER. NaN counts as STABLE."""
+    # STABLE is the usual answer mid-session: settle it with one magnitude check
+    if abs(delta) > thr:
+        return 1 if delta > 0 else -1
+    return 0
+
 def classify(delta, thr=2.0):
-    if delta > thr:
-        return "BETTER"
-    elif delta < -thr:
-        return "WORSE"
-    return "STABLE"
+    return CODES[classify_code(delta, thr) + 1]
+
+def classify_vec(deltas, thr=2.0):
+    """classify_code over a whole sequence of deltas -> array("b") of codes."""
+    return array("b", [classify_code(d, thr) for d in deltas])
+
+def trend_from_spreads(s0, spread, thr=2.0):
+    """
+    One forecast step from dew spreads (temp - dew): s0 is the session's
+    first spread, spread the newest. forecast() and the UI's incremental
+    update (which caches s0) both come through here.
+    """
+    return classify(spread - s0, thr)
+
+def forecast_arr(temp, dew, thr=2.0):
+    """
+    Same trend as forecast(), but on two parallel sequences (SoA layout)
+    e.g. array("d") columns of temperature and dew point, no dict lookups.
+    """
+    n = len(temp)
+    if n < 2:
+        return "NEED MORE DATA"
+    return trend_from_spreads(temp[0] - dew[0], temp[n - 1] - dew[n - 1], thr)
 
-def forecast(session):
+def forecast(session, thr=2.0):
     """
     session: list of dicts like
         {"t": datetime, "alt": float, "temp": float, "dew": float, "rh": float}
@@ -16,4 +45,4 @@ def forecast(session):
         return "NEED MORE DATA"
     s0 = session[0]["temp"] - session[0]["dew"]
     sN = session[-1]["temp"] - session[-1]["dew"]
-    return classify(sN - s0)
+    return trend_from_spreads(s0, sN, thr)
@@ -1,38 +1,146 @@
 # Centralized logging: write finished sessions to a safe, writable folder.
 
+import os
+import time
+import itertools
+import threading
 import datetime as dt
+from functools import cache
 from pathlib import Path
+from types import SimpleNamespace
+from array import array
 
-# Always-writable app sandbox path in Pyto:
-LOG_DIR = Path.home() / "Documents" / "Forecast_App_Logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+@cache
+def log_dir() -> Path:
+    """
+    Always-writable app sandbox path in Pyto: ~/Documents/Forecast_App_Logs.
+    Resolved and created on first use, then cached for the process.
+    """
+    d = Path.home() / "Documents" / "Forecast_App_Logs"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+def new_session_state():
+    """
+    Empty session record in SoA layout: one column per field, row i is
+    (t_ns[i], alt[i], temp[i], dew[i], rh[i]). t_ns holds time.time_ns()
+    ints (array("q")), the rest are array("d"). iso caches the ISO strings
+    of t_ns; save_log() fills it lazily, only for rows not formatted yet.
+    s0 is the first reading's dew spread (temp - dew), set by the UI.
+    """
+    return SimpleNamespace(t_ns=array("q"), iso=[], alt=array("d"), temp=array("d"),
+                           dew=array("d"), rh=array("d"), s0=None)
+
+def clear_session_state(state):
+    for col in (state.t_ns, state.iso, state.alt, state.temp, state.dew, state.rh):
+        del col[:]
+    state.s0 = None
+
+def _fill_iso(state):
+    """Format the timestamps added since the last save (local time, like datetime.now())."""
+    iso = state.iso
+    if len(iso) < len(state.t_ns):
+        fromts = dt.datetime.fromtimestamp
+        iso.extend([fromts(ns / 1e9).isoformat() for ns in state.t_ns[len(iso):]])
+    return iso
+
+# Output buffer reused by save_log(): it only grows to the largest session
+# seen, so later saves don't allocate. _BUF_LOCK is held from formatting
+# until the background write of _BUF is done; a save that finds it taken
+# (previous write stuck on a slow filesystem) uses a one-off buffer instead
+# of waiting on the UI thread.
+_BUF = bytearray()
+_BUF_LOCK = threading.Lock()
+
+def _fill_buf(buf, chunks) -> int:
+    """Copy byte chunks into buf from offset 0; return the used length."""
+    pos = 0
+    for c in chunks:
+        end = pos + len(c)
+        buf[pos:end] = c        # overwrite in place; grows only past the old high-water mark
+        pos = end
+    return pos
+
+def _write_file(fname, buf):
+    """Write bytes with raw os calls (no TextIOWrapper); usually one syscall."""
+    fd = os.open(fname, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(buf)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
-def save_log(session, window=None):
+# Threads flushing save_log() buffers that may still be running.
+_PENDING = []
+
+def wait_pending(timeout=None):
+    """Block until every background log write is done (or timeout seconds in total)."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for t in list(_PENDING):
+        t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+    _PENDING[:] = [t for t in _PENDING if t.is_alive()]
+
+def _report(err, window, from_thread=False):
+    msg = f"Could not save log:\n{err}"
+    if window is None:
+        print("Log-file error:", err)
+        return
+    try:
+        if from_thread:
+            # dialogs must be opened on the UI thread
+            window.app.loop.call_soon_threadsafe(window.error_dialog, "Log-file error", msg)
+        else:
+            window.error_dialog("Log-file error", msg)
+    except Exception:
+        pass
+
+def _flush(fname, buf, n, window, lock):
+    try:
+        _write_file(fname, memoryview(buf)[:n])
+    except (PermissionError, OSError) as err:
+        _report(err, window, from_thread=True)
+    finally:
+        if lock is not None:
+            lock.release()      # buf is _BUF: free it for the next save
+
+def save_log(state, window=None):
     """
-    Write current session to LOG_DIR. Returns filename (str) or None.
-    If window (toga.Window) is provided, shows a dialog on error.
+    Write current session (see new_session_state) to log_dir().
+    Rows are formatted on the calling thread; the file write itself runs on
+    a background thread, so the UI doesn't wait on the filesystem.
+    Returns filename (str) or None; the name is returned before the write
+    finishes, use wait_pending() to block until it's on disk. Never waits
+    for an earlier write still in progress.
+    If window (toga.Window) is provided, shows a dialog on error (a failed
+    background write is marshalled back to the UI thread for that).
     """
-    if not session:
+    if not state.t_ns:
         return None
 
     ts = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-    fname = LOG_DIR / f"session_{ts}.txt"
     try:
-        with fname.open("w", encoding="utf-8") as f:
-            f.write("# time_iso,alt_m,temp_C,dew_C,humidity_%\n")
-            for r in session:
-                f.write(
-                    f'{r["t"].isoformat()},'
-                    f'{r["alt"]},{r["temp"]},{r["dew"]},{r["rh"]}\n'
-                )
-        return fname.name
+        fname = log_dir() / f"session_{ts}.txt"
     except (PermissionError, OSError) as err:
-        if window is not None:
-            try:
-                window.error_dialog("Log-file error", f"Could not save log:\n{err}")
-            except Exception:
-                pass
-        else:
-            print("Log-file error:", err)
+        _report(err, window)
         return None
-
+    # format every row into one buffer (pooled _BUF when free), then hand the file one big write
+    rows = (
+        f"{iso},{alt},{temp},{dew},{rh}\n".encode("ascii")
+        for iso, alt, temp, dew, rh in zip(_fill_iso(state), state.alt, state.temp, state.dew, state.rh)
+    )
+    if _BUF_LOCK.acquire(blocking=False):
+        buf, lock = _BUF, _BUF_LOCK
+    else:
+        buf, lock = bytearray(), None       # _BUF still being written
+    try:
+        n = _fill_buf(buf, itertools.chain((b"# time_iso,alt_m,temp_C,dew_C,humidity_%\n",), rows))
+    except BaseException:
+        if lock is not None:
+            lock.release()
+        raise
+    t = threading.Thread(target=_flush, args=(fname, buf, n, window, lock), daemon=True)
+    _PENDING[:] = [p for p in _PENDING if p.is_alive()]
+    _PENDING.append(t)
+    t.start()
+    return fname.name
@@ -1,10 +1,8 @@
 # Toga UI: wires inputs/buttons to the forecast + logging utilities.
 
-import os, sys
-import datetime as dt
-import toga
-from toga.style.pack import COLUMN, ROW, LEFT, Pack, CENTER
-from toga.colors import rgb, WHITE, BLACK
+import os, re, sys, time
+# toga is imported inside build()/main(): importing this module (tools, tests)
+# doesn't pay for loading the GUI toolkit.
 
 WD_Folder = os.path.dirname(os.path.abspath(__file__))   # Working Dir folder of forecast_ui.py
 PARENT_Folder = os.path.dirname(WD_Folder)                      # repo root (one level up)
@@ -17,38 +15,76 @@ if PARENT_Folder not in sys.path:
 os.chdir(WD_Folder)
 
 # Now absolute, package-style imports will work reliably:
-from forecast_app.forecast import forecast
-from forecast_app.forecast_logger import save_log
+from forecast_app.forecast import CODES, trend_from_spreads
+from forecast_app.forecast_logger import save_log, wait_pending, new_session_state, clear_session_state
 
 # LOAD CONFIG
-from forecast_app.config_loader import load_config, get, path_in_docs, atmosphere_constants_SI
+from forecast_app.config_loader import load_config, path_in_docs, atmosphere_constants_SI
 cfg = load_config()
 atm = atmosphere_constants_SI(cfg)
 
-# Examples:
-threshold = get(cfg, "forecast.constants.dew_spread_threshold", 2.0)
-need_n    = get(cfg, "forecast.constants.min_samples_for_forecast", 2)
+# Examples (keys missing from the file fall back to the shipped defaults):
+threshold = cfg.forecast.constants.dew_spread_threshold
+need_n    = cfg.forecast.constants.min_samples_for_forecast
 
-log_dir = path_in_docs(get(cfg, "app.log_dir", "MountainForecastLogs"))
+log_dir = path_in_docs(cfg.app.log_dir)
 # Pass `threshold` into your algorithm; use `log_dir` in your logger.
 
 # If you want to show help text somewhere:
-desc = get(cfg, "descriptions.forecast.constants.dew_spread_threshold")
+desc = cfg.descriptions.forecast.constants.dew_spread_threshold
+
+# UI variants, picked with [ui] style in config.toml:
+#   "filled" → colored buttons + colored trend banner (good contrast on iOS)
+#   "plain"  → native widgets, no colors (the old fast prototype look)
+# (colors as CSS strings, which Pack accepts, so no toga import is needed here)
+STYLES = {
+    "filled": {
+        "BTN_PRIMARY_BG": "#2563eb",   # blue        rgb(37, 99, 235)
+        "BTN_SECOND_BG":  "#6b7280",   # gray        rgb(107, 114, 128)
+        "BTN_DANGER_BG":  "#dc2626",   # red         rgb(220, 38, 38)
+        "BANNER_NEUTRAL": "#1f2937",   # dark slate  rgb(31, 41, 55)
+        "BANNER_GOOD":    "#10b981",   # green       rgb(16, 185, 129)
+        "BANNER_BAD":     "#dc2626",   # red         rgb(220, 38, 38)
+        "BTN_TXT":        "white",
+    },
+    "plain": {},
+}
+ui_style = cfg.ui.style
+
+# a plain decimal as typed on the keypad: "12", "-3.5", ".5", " 7 "
+_NUM_RE = re.compile(r"\s*[-+]?(?:\d+\.?\d*|\.\d+)\s*")
+
+# banner text is PREFIX + count + " readings)"; prefixes are built once here
+TREND_PREFIX = {t: f"Trend: {t}   (" for t in (*CODES, "NEED MORE DATA")}
 
 
 
 def build(app):
-    session = []  # lives in this closure
+    import toga
+    from toga.style.pack import COLUMN, ROW, LEFT, Pack, CENTER
 
-    # --- color palette for buttons (good contrast on iOS) ---
-    BTN_PRIMARY_BG = rgb(37, 99, 235)   # blue
-    BTN_SECOND_BG  = rgb(107, 114, 128) # gray
-    BTN_DANGER_BG  = rgb(220, 38, 38)   # red
-    BANNER_NEUTRAL = rgb(31, 41, 55)     # dark slate
-    BANNER_GOOD    = rgb(16,185,129)     # green
-    BANNER_BAD     = rgb(220, 38, 38)    # red
-    BTN_TXT        = WHITE
+    state = new_session_state()  # SoA columns; lives in this closure
+    palette = STYLES.get(ui_style, STYLES["filled"])
 
+    # banner background currently applied; style updates re-layout the
+    # native widget, so only push a color when it actually changes
+    banner_bg = palette.get("BANNER_NEUTRAL")
+    BANNER_FOR = {"BETTER": "BANNER_GOOD", "WORSE": "BANNER_BAD"}  # else NEUTRAL
+
+    def set_banner_bg(key):
+        nonlocal banner_bg
+        if not palette:
+            return
+        bg = palette[key]
+        if bg != banner_bg:
+            trend_lbl.style.update(background_color=bg)
+            banner_bg = bg
+
+    def paint(bg, **pack):
+        """Pack style, plus fill/text colors when the variant has a palette."""
+        if palette:
+            pack.update(background_color=palette[bg], color=palette["BTN_TXT"])
+        return Pack(**pack)
 
     # -- widgets
     alt_in  = toga.TextInput(placeholder="Altitude (m)")
@@ -59,47 +95,51 @@ def build(app):
     # create a bold, centered banner label
     trend_lbl = toga.Label(
     "No data yet",
-    style=Pack(
+    style=paint(
+        "BANNER_NEUTRAL",
         padding_top=12, padding_bottom=12, padding_left=10, padding_right=10,
-        background_color=BANNER_NEUTRAL, color=BTN_TXT,
         text_align=CENTER, font_size=18
         )
     )
 
     # -- callbacks
     def add_reading(widget):
-        try:
-            reading = {
-                "t":   dt.datetime.now(),
-                "alt": float(alt_in.value),
-                "temp": float(temp_in.value),
-                "dew":  float(dew_in.value),
-                "rh":   float(rh_in.value),
-            }
-        except ValueError:
+        # validate first: a regex miss is cheaper than raising/catching ValueError
+        vals = (alt_in.value, temp_in.value, dew_in.value, rh_in.value)
+        if not all(_NUM_RE.fullmatch(v or "") for v in vals):
             trend_lbl.text = "Fill all 4 numbers"
             return
-        session.append(reading)
+        alt, temp, dew, rh = map(float, vals)
+        state.t_ns.append(time.time_ns())   # ISO text is built later, in save_log
+        state.alt.append(alt)
+        state.temp.append(temp)
+        state.dew.append(dew)
+        state.rh.append(rh)
+
+        # incremental forecast: the first spread is fixed for the session,
+        # so each tap only needs the newest one
+        spread = temp - dew
+        if state.s0 is None:
+            state.s0 = spread
+            trend = "NEED MORE DATA"
+        else:
+            trend = trend_from_spreads(state.s0, spread, threshold)
 
         # update the banner color when you compute the trend
-        trend = forecast(session)
-        trend_lbl.text = f"Trend: {trend}   ({len(session)} readings)"
-        if trend == "BETTER":
-            trend_lbl.style.update(background_color=BANNER_GOOD)
-        elif trend == "WORSE":
-            trend_lbl.style.update(background_color=BANNER_BAD)
-        else:  # "STABLE" or "NEED MORE DATA"
-            trend_lbl.style.update(background_color=BANNER_NEUTRAL)
+        trend_lbl.text = TREND_PREFIX[trend] + str(len(state.t_ns)) + " readings)"
+        set_banner_bg(BANNER_FOR.get(trend, "BANNER_NEUTRAL"))  # "STABLE"/"NEED MORE DATA" → neutral
 
     def new_session(widget):
-        log = save_log(session, app.main_window)
-        session.clear()
+        log = save_log(state, app.main_window)
+        clear_session_state(state)
         for box in (alt_in, temp_in, dew_in, rh_in):
             box.value = ""
         trend_lbl.text = "New session started" + (f" – saved {log}" if log else "")
+        set_banner_bg("BANNER_NEUTRAL")
 
     def quit_app(widget):
-        save_log(session, app.main_window)
+        save_log(state, app.main_window)
+        wait_pending(timeout=1.0)   # let the background write land before exiting
         # Close immediately (snappier than app.exit() alone):
         try:
             app.main_window.close()
@@ -129,18 +169,12 @@ def build(app):
     add_btn = toga.Button(
         "Add reading",
         on_press=add_reading,
-        style=Pack(
-            flex=1, padding=10, padding_right=5,
-            background_color=BTN_PRIMARY_BG, color=BTN_TXT
-        ),
+        style=paint("BTN_PRIMARY_BG", flex=1, padding=10, padding_right=5),
     )
     new_btn = toga.Button(
         "New session",
         on_press=new_session,
-        style=Pack(
-            flex=1, padding=10, padding_left=5,
-            background_color=BTN_SECOND_BG, color=BTN_TXT
-        ),
+        style=paint("BTN_SECOND_BG", flex=1, padding=10, padding_left=5),
     )
     buttons.add(add_btn)
     buttons.add(new_btn)
@@ -151,9 +185,7 @@ def build(app):
     exit_btn = toga.Button(
         "Exit",
         on_press=quit_app,
-        style=Pack(
-            padding=10, background_color=BTN_DANGER_BG, color=BTN_TXT
-        ),
+        style=paint("BTN_DANGER_BG", padding=10),
     )
     box.add(exit_btn)
 
@@ -162,6 +194,7 @@ def build(app):
     return box
 
 def main():
+    import toga
     return toga.App("Mountain Forecast", "org.example.mountain_forecast", startup=build)
 
 if __name__ == "__main__":
@@ -42,13 +42,25 @@ References (Wikipedia summaries for formulas and constants):
 Notes:
   * Units: Pressures are handled in hPa for I/O, but formula uses Pa internally.
   * This module is intentionally lightweight and has no external dependencies.
+    If Numba is installed, the scalar pressure kernels are compiled with
+    explicit signatures at import (cached on disk, so later runs load the
+    machine code); without it they run as plain Python.
 """
 
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional, List, Tuple
-import math
+from typing import NamedTuple, Optional, List, Tuple
 import time
 
+# Optional Numba: same pattern as config_loader's tomllib/tomli fallback.
+try:
+    from numba import njit
+except ImportError:                      # plain Python: njit is a no-op decorator
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda f: f
+
 # ---- Physical constants (SI) ----
 T0_K = 288.15          # K, sea-level standard temperature
 L0_K_per_m = -0.0065   # K/m, lapse rate in troposphere (negative)
@@ -56,10 +68,18 @@ g_m_s2 = 9.80665       # m/s^2
 M0_kg_per_mol = 0.0289644  # kg/mol
 R_J_per_molK = 8.3144598   # J/(mol·K)
 
+# Barometric exponent (g*M0)/(R*L0) ≈ -5.2558, constant for the troposphere
+_BARO_EXP = (g_m_s2 * M0_kg_per_mol) / (R_J_per_molK * L0_K_per_m)
+
+# Numba fast-math minus "nnan"/"ninf": a NaN altitude must come out NaN,
+# not whatever LLVM makes of a NaN it was told can't occur
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
 # Unit helpers
 HPA_TO_PA = 100.0
 PA_TO_HPA = 1.0 / HPA_TO_PA
 
+@njit("float64(float64, float64)", cache=True, fastmath=_FASTMATH)
 def pressure_at_altitude_pa(P0_pa: float, H_m: float) -> float:
     """
     Compute static pressure P(H) [Pa] at altitude H [m] given sea-level pressure P0 [Pa]
@@ -76,13 +96,16 @@ def pressure_at_altitude_pa(P0_pa: float, H_m: float) -> float:
     Returns:
         Pressure at altitude H in Pa.
     """
+    # Outside model validity, clamp to small positive number
+    # (a conditional expression: no builtin call in CPython, a select under Numba;
+    # written as <= so a NaN altitude stays NaN, as max(denom, 1e-6) left it)
     denom = T0_K + L0_K_per_m * H_m
-    if denom <= 0:
-        # Outside model validity, clamp to small positive number
-        denom = 1e-6
-    exponent = (g_m_s2 * M0_kg_per_mol) / (R_J_per_molK * L0_K_per_m)
-    return P0_pa * (T0_K / denom) ** exponent
+    denom = 1e-6 if denom <= 1e-6 else denom
+    # ** with the constant exponent rather than exp(k * log(x)): one C pow()
+    # in plain CPython (Numba is optional), and fastmath LLVM folds it itself
+    return P0_pa * (T0_K / denom) ** _BARO_EXP
 
+@njit("float64(float64, float64, float64)", cache=True, fastmath=_FASTMATH)
 def adjust_pressure_to_reference_hpa(P_meas_hpa: float, H_meas_m: float, H_ref_m: float) -> float:
     """
     Adjust a measured pressure (at H_meas) to an equivalent pressure at a fixed reference altitude H_ref.
@@ -103,24 +126,40 @@ def adjust_pressure_to_reference_hpa(P_meas_hpa: float, H_meas_m: float, H_ref_m
     """
     deltaH = H_ref_m - H_meas_m
     denom = T0_K + L0_K_per_m * deltaH
-    if denom <= 0:
-        denom = 1e-6
-    exponent = (g_m_s2 * M0_kg_per_mol) / (R_J_per_molK * L0_K_per_m)
+    denom = 1e-6 if denom <= 1e-6 else denom
     P_meas_pa = P_meas_hpa * HPA_TO_PA
-    P_ref_pa = P_meas_pa * (T0_K / denom) ** exponent
+    P_ref_pa = P_meas_pa * (T0_K / denom) ** _BARO_EXP
     return P_ref_pa * PA_TO_HPA
 
+def adjust_pressure_to_reference_hpa_vec(P_meas_hpa, H_meas_m, H_ref_m: float) -> array:
+    """
+    Batch form of adjust_pressure_to_reference_hpa() for replaying a log:
+    P_meas_hpa and H_meas_m are equal-length sequences (lists, array("d");
+    ValueError if they differ), result is an array("d") of P_ref_hpa. One
+    pass with the constants bound to locals instead of one Python-level
+    call per sample.
+    """
+    T0, L0, exp_, to_pa, to_hpa = T0_K, L0_K_per_m, _BARO_EXP, HPA_TO_PA, PA_TO_HPA
+    out = array("d")
+    for P, H in zip(P_meas_hpa, H_meas_m, strict=True):
+        denom = T0 + L0 * (H_ref_m - H)
+        denom = 1e-6 if denom <= 1e-6 else denom
+        out.append(P * to_pa * (T0 / denom) ** exp_ * to_hpa)
+    return out
+
 def lcl_above_sensor_m(T_C: float, Td_C: float) -> float:
     """
     Estimate LCL height above the sensor [m] using the approximation:
         LCL (m AGL) ≈ 125 * (T - Td), T, Td in °C.
     Returns max(0, value) to avoid negatives from noisy inputs.
+    The engine inlines this expression on its hot paths; the function
+    stays as the documented formula.
     """
     return max(0.0, 125.0 * (T_C - Td_C))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Sample:
-    t_s: float           # Unix timestamp seconds
+    t_s: float           # Unix timestamp seconds (the engine stores integer ns)
     T_C: float
     Td_C: float
     RH_pct: float
@@ -128,7 +167,7 @@ class Sample:
     P_hpa: float
     LCL_meas_mAMSL: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class EngineConfig:
     trend_window_s: int = 3 * 3600  # 3 hours for tendencies
     # Rule thresholds (can be tuned):
@@ -139,25 +178,80 @@ class EngineConfig:
     lcl_low_above_m: float = 500.0        # cloud base within 0.5 km above you
     lcl_far_above_m: float = 1500.0       # fair bias if >1.5 km above you
 
-@dataclass
+@dataclass(slots=True)
 class RuleResult:
     verdict: str                   # "Better", "Stable", "Worse"
     eta_hours: Tuple[int, int]     # (lower_bound_hours, upper_bound_hours)
     details: dict = field(default_factory=dict)
 
+class PressureTrend(NamedTuple):
+    """First-vs-last pressure tendency over the trend window."""
+    hours: float
+    P_ref0_hpa: float
+    P_ref1_hpa: float
+    dP_hpa: float
+    dP_hpa_per_h: float
+
+class MoistureTrend(NamedTuple):
+    """First-vs-last moisture / cloud-base tendencies over the trend window."""
+    delta0_C: float
+    delta1_C: float
+    dDelta_C_per_h: float
+    dTd_C_per_h: float
+    LCL0_mAMSL: float
+    LCL1_mAMSL: float
+    dLCL_m_per_h: float
+
+# Don't bother compacting the sample columns for fewer expired rows than this
+_COMPACT_MIN = 64
+
 class NowcastEngine:
-    def __init__(self, H_ref_m: Optional[float] = None, config: EngineConfig = EngineConfig()):
+    def __init__(self, H_ref_m: Optional[float] = None, config: EngineConfig = EngineConfig(),
+                 verbose: bool = False):
         """
         Initialize the engine.
 
         Args:
             H_ref_m: Optional fixed reference altitude for pressure adjustment.
                      If None, the first sample's altitude becomes the reference.
+                     Fixed once samples exist: each sample's adjusted pressure
+                     is computed once, when it is added.
             config:  EngineConfig thresholds and window.
+            verbose: Fill RuleResult.details (trends, LCL, rule flags, current
+                     sample). Off by default: details stays {} and evaluate()
+                     only computes what the verdict needs.
         """
         self.config = config
-        self.samples: List[Sample] = []
+        self.verbose = verbose
         self.H_ref_m = H_ref_m
+        # Samples stored as struct-of-arrays: one column per field.
+        # Rows [_lo, len) are the live trend window; rows before _lo expired.
+        # Readings are float64 ("d"): float32 rounding moves one-decimal
+        # inputs across the inclusive rule thresholds (Δ <= 3 °C, LCL <= 500 m).
+        # Timestamps are integer Unix ns ("q"): exact, and the window trim is
+        # an int compare.
+        self._t_ns = array("q")
+        self._T_C = array("d")
+        self._Td_C = array("d")
+        self._RH_pct = array("d")
+        self._H_m = array("d")
+        self._P_hpa = array("d")
+        self._P_ref_hpa = array("d")    # P_hpa adjusted to H_ref_m, at insertion
+        self._LCL_meas = array("d")     # value, only meaningful where _has_LCL[i]
+        self._has_LCL = array("B")      # 1 if LCL_meas_mAMSL was given
+        self._lo = 0
+
+    def _sample(self, i: int) -> Sample:
+        """Row i of the columns as a Sample."""
+        return Sample(self._t_ns[i] / 1e9, self._T_C[i], self._Td_C[i], self._RH_pct[i],
+                      self._H_m[i], self._P_hpa[i],
+                      self._LCL_meas[i] if self._has_LCL[i] else None)
+
+    @property
+    def samples(self) -> List[Sample]:
+        """Samples currently in the trend window, oldest first."""
+        self._trim()
+        return [self._sample(i) for i in range(self._lo, len(self._t_ns))]
 
     def add_sample(self,
                    T_C: float,
@@ -167,60 +261,91 @@ class NowcastEngine:
                    P_hpa: float,
                    LCL_meas_mAMSL: Optional[float] = None,
                    t_s: Optional[float] = None):
-        """Add a new observation sample."""
-        if t_s is None:
-            t_s = time.time()
+        """
+        Add a new observation sample (samples are expected in time order).
+        t_s is Unix seconds; None means now. It is kept as integer ns, rounded
+        so 4.1 s doesn't truncate to 4.099999999 s. None takes time.time_ns()
+        rather than monotonic_ns(): callers pass wall-clock timestamps, and
+        both kinds must share one epoch.
+        """
+        t_ns = time.time_ns() if t_s is None else round(t_s * 1e9)
         if self.H_ref_m is None:
             self.H_ref_m = H_m
-        self.samples.append(Sample(t_s, T_C, Td_C, RH_pct, H_m, P_hpa, LCL_meas_mAMSL))
-        # drop old samples outside the trend window
-        t_cut = t_s - self.config.trend_window_s
-        self.samples = [s for s in self.samples if s.t_s >= t_cut]
-
-    def _trend(self) -> dict:
-        """Compute trends over the stored window (using first vs last sample)."""
-        if len(self.samples) < 2:
-            return {"hours": 0.0}
-
-        s0 = self.samples[0]
-        s1 = self.samples[-1]
-        dt_h = max(1e-6, (s1.t_s - s0.t_s) / 3600.0)
+        self._t_ns.append(t_ns)
+        self._T_C.append(T_C)
+        self._Td_C.append(Td_C)
+        self._RH_pct.append(RH_pct)
+        self._H_m.append(H_m)
+        self._P_hpa.append(P_hpa)
+        self._P_ref_hpa.append(adjust_pressure_to_reference_hpa(P_hpa, H_m, self.H_ref_m))
+        self._LCL_meas.append(0.0 if LCL_meas_mAMSL is None else LCL_meas_mAMSL)
+        self._has_LCL.append(LCL_meas_mAMSL is not None)
+
+    def _trim(self):
+        """
+        Expire samples older than the trend window before the latest one.
+        Run lazily by the readers (evaluate(), samples), not on every add:
+        with a fast sensor and a slow forecast cadence the trim is paid once
+        per evaluation. Until then expired rows stay in memory.
+        """
+        t, lo = self._t_ns, self._lo
+        if len(t) == lo:
+            return
+        # expired rows are skipped by advancing _lo
+        t_cut = t[-1] - int(self.config.trend_window_s * 1_000_000_000)
+        while t[lo] < t_cut:
+            lo += 1
+        self._lo = lo
+        # once expired rows outnumber live ones, drop them in one slice delete
+        # per column: amortized O(1) per sample, memory bounded to ~2x the window
+        if lo >= _COMPACT_MIN and 2 * lo >= len(t):
+            self._compact()
+
+    def _compact(self):
+        """Physically remove the expired rows [0, _lo) from every column."""
+        lo = self._lo
+        for col in (self._t_ns, self._T_C, self._Td_C, self._RH_pct, self._H_m,
+                    self._P_hpa, self._P_ref_hpa, self._LCL_meas, self._has_LCL):
+            del col[:lo]
+        self._lo = 0
+
+    def _pressure_trend(self) -> Optional[PressureTrend]:
+        """
+        Pressure tendency over the stored window (first vs last sample).
+        Returns None with fewer than 2 samples.
+        """
+        n = len(self._t_ns)
+        lo = self._lo
+        if n - lo < 2:
+            return None
+        dt_h = max(1e-6, (self._t_ns[n - 1] - self._t_ns[lo]) / 3.6e12)   # ns -> h
 
-        # Adjust both pressures to the same reference altitude
-        Pref0 = adjust_pressure_to_reference_hpa(s0.P_hpa, s0.H_m, self.H_ref_m)
-        Pref1 = adjust_pressure_to_reference_hpa(s1.P_hpa, s1.H_m, self.H_ref_m)
+        # Both pressures adjusted to the same reference altitude (cached per sample)
+        Pref0 = self._P_ref_hpa[lo]
+        Pref1 = self._P_ref_hpa[n - 1]
 
         dP_hpa = Pref1 - Pref0
-        dP_hpa_per_h = dP_hpa / dt_h
+        return PressureTrend(dt_h, Pref0, Pref1, dP_hpa, dP_hpa / dt_h)
+
+    def _moisture_trend(self, dt_h: float) -> MoistureTrend:
+        """Dew-point / LCL tendencies over the same window; needs >= 2 samples."""
+        i, j = self._lo, len(self._t_ns) - 1
+        T, Td, H = self._T_C, self._Td_C, self._H_m
 
         # Dew point depression Δ = T - Td
-        delta0 = s0.T_C - s0.Td_C
-        delta1 = s1.T_C - s1.Td_C
+        delta0 = T[i] - Td[i]
+        delta1 = T[j] - Td[j]
         dDelta_C = (delta1 - delta0) / dt_h  # change per hour
         # Td trend
-        dTd_C = (s1.Td_C - s0.Td_C) / dt_h
+        dTd_C = (Td[j] - Td[i]) / dt_h
 
-        # LCL estimates
-        lcl0_above = lcl_above_sensor_m(s0.T_C, s0.Td_C)
-        lcl1_above = lcl_above_sensor_m(s1.T_C, s1.Td_C)
-        lcl0_amsl = s0.H_m + lcl0_above
-        lcl1_amsl = s1.H_m + lcl1_above
+        # LCL estimates (lcl_above_sensor_m, inlined)
+        lcl0_amsl = H[i] + max(0.0, 125.0 * delta0)
+        lcl1_amsl = H[j] + max(0.0, 125.0 * delta1)
         dLCL_m_per_h = (lcl1_amsl - lcl0_amsl) / dt_h
 
-        return dict(
-            hours=dt_h,
-            P_ref0_hpa=Pref0,
-            P_ref1_hpa=Pref1,
-            dP_hpa=dP_hpa,
-            dP_hpa_per_h=dP_hpa_per_h,
-            delta0_C=delta0,
-            delta1_C=delta1,
-            dDelta_C_per_h=dDelta_C,
-            dTd_C_per_h=dTd_C,
-            LCL0_mAMSL=lcl0_amsl,
-            LCL1_mAMSL=lcl1_amsl,
-            dLCL_m_per_h=dLCL_m_per_h
-        )
+        return MoistureTrend(delta0, delta1, dDelta_C, dTd_C,
+                             lcl0_amsl, lcl1_amsl, dLCL_m_per_h)
 
     def evaluate(self) -> RuleResult:
         """
@@ -234,46 +359,84 @@ class NowcastEngine:
           - Otherwise STABLE: ETA 6–12 h.
 
         Also reports LCL_est vs LCL_meas (if available) on the latest sample.
+
+        details is only filled when the engine is verbose. Otherwise the
+        moisture trend is skipped when pressure plus the latest sample
+        already force Strong WORSENING.
         """
-        cfg = self.config
-        if not self.samples:
+        self._trim()
+        n = len(self._t_ns)
+        if n == self._lo:
             return RuleResult("Stable", (6, 12), details={"note": "No samples yet."})
 
-        trends = self._trend()
-        details = {"trends": trends}
+        # Thresholds as locals, read once per call
+        cfg = self.config
+        rapid_fall_hpa_per_h = cfg.rapid_fall_hpa_per_h
+        three_hour_drop_hpa = cfg.three_hour_drop_hpa
+        depression_close_C = cfg.dewpoint_depression_close_C
+        td_rise_C_per_h = cfg.td_rise_C_over_3h / 3.0    # per-hour equivalent
+        lcl_low_above_m = cfg.lcl_low_above_m
+        lcl_far_above_m = cfg.lcl_far_above_m
+
+        verbose = self.verbose
+        details = {}
+        ptrend = self._pressure_trend()
+        if ptrend is None:      # single sample: no tendencies yet
+            hours = dP = dP_per_h = 0.0
+            if verbose:
+                details["trends"] = {"hours": 0.0}
+        else:
+            hours, dP, dP_per_h = ptrend.hours, ptrend.dP_hpa, ptrend.dP_hpa_per_h
+            if verbose:
+                details["trends"] = ptrend._asdict()
 
         # Latest sample
-        s = self.samples[-1]
+        s = self._sample(n - 1)
         delta_C = s.T_C - s.Td_C
-        lcl_est_above = lcl_above_sensor_m(s.T_C, s.Td_C)
-        lcl_est_amsl = s.H_m + lcl_est_above
-
-        # LCL comparison (if measured given)
-        lcl_meas_amsl = s.LCL_meas_mAMSL
-        if lcl_meas_amsl is not None:
-            lcl_err_m = lcl_est_amsl - lcl_meas_amsl
+        lcl_est_above = max(0.0, 125.0 * delta_C)      # lcl_above_sensor_m, inlined
+
+        if verbose:
+            # LCL comparison (if measured given)
+            lcl_est_amsl = s.H_m + lcl_est_above
+            lcl_meas_amsl = s.LCL_meas_mAMSL
+            if lcl_meas_amsl is not None:
+                lcl_err_m = lcl_est_amsl - lcl_meas_amsl
+            else:
+                lcl_err_m = None
+
+            details["LCL"] = {
+                "estimated_mAMSL": lcl_est_amsl,
+                "estimated_above_sensor_m": lcl_est_above,
+                "measured_mAMSL": lcl_meas_amsl,
+                "estimate_minus_measured_m": lcl_err_m
+            }
+
+        # Rule flags: pressure + latest sample first
+        rapid_fall = dP_per_h <= -rapid_fall_hpa_per_h
+        three_hr_drop = dP <= -three_hour_drop_hpa and hours >= 2.0
+        near_sat = delta_C <= depression_close_C
+        lcl_low_now = lcl_est_above <= lcl_low_above_m
+        # Strong worsening needs no moisture trend when these already hold
+        decided = (rapid_fall or three_hr_drop) and (near_sat or lcl_low_now)
+
+        if decided and not verbose:
+            td_rising = delta_decreasing = lcl_rising_far = None     # not evaluated
         else:
-            lcl_err_m = None
-
-        details["LCL"] = {
-            "estimated_mAMSL": lcl_est_amsl,
-            "estimated_above_sensor_m": lcl_est_above,
-            "measured_mAMSL": lcl_meas_amsl,
-            "estimate_minus_measured_m": lcl_err_m
-        }
-
-        # Rule flags
-        rapid_fall = trends.get("dP_hpa_per_h", 0.0) <= -cfg.rapid_fall_hpa_per_h
-        three_hr_drop = trends.get("dP_hpa", 0.0) <= -cfg.three_hour_drop_hpa and trends.get("hours", 0.0) >= 2.0
-        near_sat = delta_C <= cfg.dewpoint_depression_close_C
-        td_rising = trends.get("dTd_C_per_h", 0.0) >= (cfg.td_rise_C_over_3h / 3.0)  # per-hour equivalent
-        delta_decreasing = trends.get("dDelta_C_per_h", 0.0) < 0.0
-        lcl_low_now = lcl_est_above <= cfg.lcl_low_above_m
-        lcl_rising_far = (trends.get("dLCL_m_per_h", 0.0) > 0.0) and (lcl_est_above >= cfg.lcl_far_above_m)
+            if ptrend is None:
+                dTd_per_h = dDelta_per_h = dLCL_per_h = 0.0
+            else:
+                mtrend = self._moisture_trend(hours)
+                dTd_per_h, dDelta_per_h = mtrend.dTd_C_per_h, mtrend.dDelta_C_per_h
+                dLCL_per_h = mtrend.dLCL_m_per_h
+                if verbose:
+                    details["trends"].update(mtrend._asdict())
+            td_rising = dTd_per_h >= td_rise_C_per_h
+            delta_decreasing = dDelta_per_h < 0.0
+            lcl_rising_far = (dLCL_per_h > 0.0) and (lcl_est_above >= lcl_far_above_m)
 
         # Decision logic
         # Strong worsening
-        if (rapid_fall or three_hr_drop) and (near_sat or td_rising or lcl_low_now):
+        if decided or ((rapid_fall or three_hr_drop) and td_rising):
             verdict = "Worse"
             eta = (1, 6)
         # Moderate worsening
@@ -281,33 +444,34 @@ class NowcastEngine:
             verdict = "Worse"
             eta = (3, 12)
         # Improving
-        elif (trends.get("dP_hpa_per_h", 0.0) >= 0.2) and (trends.get("dDelta_C_per_h", 0.0) > 0.0) and lcl_rising_far:
+        elif (dP_per_h >= 0.2) and (dDelta_per_h > 0.0) and lcl_rising_far:
             verdict = "Better"
             eta = (3, 12)
         else:
             verdict = "Stable"
             eta = (6, 12)
 
-        details["rule_flags"] = dict(
-            rapid_fall=rapid_fall,
-            three_hr_drop=three_hr_drop,
-            near_sat=near_sat,
-            td_rising=td_rising,
-            delta_decreasing=delta_decreasing,
-            lcl_low_now=lcl_low_now,
-            lcl_rising_far=lcl_rising_far
-        )
-        details["current"] = dict(
-            T_C=s.T_C, Td_C=s.Td_C, RH_pct=s.RH_pct, H_m=s.H_m, P_hpa=s.P_hpa,
-            P_ref_hpa=adjust_pressure_to_reference_hpa(s.P_hpa, s.H_m, self.H_ref_m),
-            dewpoint_depression_C=delta_C
-        )
+        if verbose:
+            details["rule_flags"] = dict(
+                rapid_fall=rapid_fall,
+                three_hr_drop=three_hr_drop,
+                near_sat=near_sat,
+                td_rising=td_rising,
+                delta_decreasing=delta_decreasing,
+                lcl_low_now=lcl_low_now,
+                lcl_rising_far=lcl_rising_far
+            )
+            details["current"] = dict(
+                T_C=s.T_C, Td_C=s.Td_C, RH_pct=s.RH_pct, H_m=s.H_m, P_hpa=s.P_hpa,
+                P_ref_hpa=self._P_ref_hpa[n - 1],
+                dewpoint_depression_C=delta_C
+            )
 
         return RuleResult(verdict, eta, details)
 
 # ---- Minimal demo when run as a script ----
 if __name__ == "__main__":
-    eng = NowcastEngine(H_ref_m=None)
+    eng = NowcastEngine(H_ref_m=None, verbose=True)
     # Example: add two samples ~3h apart with falling pressure and moisture loading
     t0 = time.time()
     eng.add_sample(T_C=12.0, Td_C=7.0, RH_pct=70.0, H_m=2000.0, P_hpa=780.0, t_s=t0)
@@ -0,0 +1,38 @@
+# Checks merging a hand-edited config.toml over the shipped defaults
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))   # repo root
+
+try:                                     # Py 3.11+
+    import tomllib as _toml
+except Exception:                        # Py 3.10 → needs tomli
+    import tomli as _toml
+
+from forecast_app.config_loader import _merged, _sha256, _to_ns
+from forecast_app.config_defaults import DEFAULTS, DEFAULT_SHA256
+
+CONFIG_TOML = Path(__file__).resolve().parents[1] / "forecast_app" / "config.toml"
+
+
+def test_defaults_module_matches_config_toml():
+    # config_defaults.py must be regenerated whenever config.toml changes
+    assert _sha256(CONFIG_TOML.read_bytes()) == DEFAULT_SHA256
+    assert _toml.loads(CONFIG_TOML.read_text(encoding="utf-8")) == DEFAULTS
+
+def test_merged_overrides_and_keeps_missing_keys():
+    cfg = _merged(DEFAULTS, {"ui": {"style": "plain"}, "extra": 1})
+    assert cfg["ui"]["style"] == "plain"
+    assert cfg["extra"] == 1
+    assert cfg["forecast"] == DEFAULTS["forecast"]
+
+def test_merged_scalar_over_table_keeps_default():
+    cfg = _to_ns(_merged(DEFAULTS, {"ui": "plain", "forecast": {"constants": 5}}))
+    assert cfg.ui.style == DEFAULTS["ui"]["style"]
+    assert (cfg.forecast.constants.dew_spread_threshold
+            == DEFAULTS["forecast"]["constants"]["dew_spread_threshold"])
+
+def test_merged_leaves_defaults_untouched():
+    before = repr(DEFAULTS)
+    _merged(DEFAULTS, {"forecast": {"constants": {"dew_spread_threshold": 9.0}}})
+    assert repr(DEFAULTS) == before
@@ -1,2 +1,71 @@
- # Checks edge cases of the algorithm
-│
\ No newline at end of file
+# Checks edge cases of the algorithm
+import importlib
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))   # repo root
+
+from forecast_app.forecast import (CODES, classify, classify_code, classify_vec, forecast, forecast_arr,
+                                   trend_from_spreads)
+
+
+@pytest.mark.parametrize("delta, code", [
+    (0.0, 0),
+    (2.0, 0),            # thresholds are exclusive: exactly ±thr is STABLE
+    (-2.0, 0),
+    (2.0001, 1),
+    (-2.0001, -1),
+    (50.0, 1),
+    (-50.0, -1),
+    (math.nan, 0),       # a bad reading must not flip the trend
+])
+def test_classify_code_boundaries(delta, code):
+    assert classify_code(delta, 2.0) == code
+    assert classify(delta, 2.0) == CODES[code + 1]
+
+def test_classify_code_custom_threshold():
+    assert classify_code(0.6, 0.5) == 1
+    assert classify_code(-0.5, 0.5) == 0
+
+def test_classify_vec_matches_scalar():
+    deltas = [-3.0, -2.0, -1.9, 0.0, math.nan, 1.9, 2.0, 3.0]
+    codes = classify_vec(deltas, 2.0)
+    assert codes.typecode == "b"
+    assert list(codes) == [classify_code(d, 2.0) for d in deltas]
+    assert list(classify_vec([], 2.0)) == []
+
+def test_forecast_arr():
+    assert forecast_arr([10.0], [5.0]) == "NEED MORE DATA"
+    assert forecast_arr([10.0, 12.0, 14.0], [5.0, 5.0, 5.0]) == "BETTER"    # spread 5 -> 9
+    assert forecast_arr([10.0, 9.0], [5.0, 6.0]) == "STABLE"                # spread 5 -> 3, not past thr
+    assert forecast_arr([10.0, 8.0], [5.0, 6.0]) == "WORSE"                 # spread 5 -> 2
+
+def test_trend_from_spreads_matches_whole_session():
+    temp, dew = [10.0, 11.0, 13.0, 8.0], [5.0, 5.5, 5.0, 6.0]
+    s0 = temp[0] - dew[0]
+    for n in range(2, len(temp) + 1):
+        session = [{"temp": t, "dew": d} for t, d in zip(temp[:n], dew[:n])]
+        step = trend_from_spreads(s0, temp[n - 1] - dew[n - 1])
+        assert step == forecast_arr(temp[:n], dew[:n]) == forecast(session)
+
+
+@pytest.fixture
+def num_re(tmp_path, monkeypatch):
+    """_NUM_RE from the UI module, imported with a throwaway HOME and cwd."""
+    monkeypatch.setenv("HOME", str(tmp_path))      # config.toml is created under ~/Documents
+    monkeypatch.chdir(tmp_path)                    # the module chdir()s on import
+    for name in ("forecast_app.config_loader", "forecast_app.forecast_toga_ui"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return importlib.import_module("forecast_app.forecast_toga_ui")._NUM_RE
+
+@pytest.mark.parametrize("text", ["12", "-3.5", "+4", ".5", "7.", " 7 ", "0", "1013.25"])
+def test_num_re_accepts(num_re, text):
+    assert num_re.fullmatch(text)
+    float(text)                                    # and float() agrees
+
+@pytest.mark.parametrize("text", ["", " ", "-", ".", "abc", "1,5", "1.2.3", "1e3", "nan", "inf", "--1", "12 34"])
+def test_num_re_rejects(num_re, text):
+    assert not num_re.fullmatch(text)
@@ -0,0 +1,81 @@
+# Checks the session log file and the pooled buffer behind save_log()
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))   # repo root
+
+from forecast_app import forecast_logger as fl
+
+HEADER = "# time_iso,alt_m,temp_C,dew_C,humidity_%\n"
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    """Logs go under a throwaway HOME; log_dir() is re-resolved for it."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    fl.log_dir.cache_clear()
+    yield tmp_path
+    fl.wait_pending()
+    fl.log_dir.cache_clear()
+
+def _session(n):
+    state = fl.new_session_state()
+    t0 = time.time_ns()
+    for i in range(n):
+        state.t_ns.append(t0 + i * 60_000_000_000)
+        state.alt.append(2000.0 + i)
+        state.temp.append(15.5 - 0.25 * i)
+        state.dew.append(5.0)
+        state.rh.append(70.0 + i)
+    return state
+
+def _expected(state):
+    rows = zip(state.iso, state.alt, state.temp, state.dew, state.rh)
+    return HEADER + "".join(f"{iso},{alt},{temp},{dew},{rh}\n" for iso, alt, temp, dew, rh in rows)
+
+def _save(state):
+    name = fl.save_log(state)
+    fl.wait_pending()
+    return (fl.log_dir() / name).read_text(encoding="ascii")
+
+def test_empty_session_writes_nothing(home):
+    assert fl.save_log(fl.new_session_state()) is None
+    assert not (home / "Documents").exists()
+
+def test_file_format():
+    state = _session(3)
+    text = _save(state)
+    assert text == _expected(state)
+    lines = text.splitlines()
+    assert lines[0] == HEADER.rstrip("\n")
+    assert lines[1].split(",")[1:] == ["2000.0", "15.5", "5.0", "70.0"]
+    assert len(state.iso) == 3 and state.iso[0] in lines[1]
+
+def test_shorter_save_leaves_no_stale_bytes():
+    _save(_session(50))
+    state = _session(2)
+    assert _save(state) == _expected(state)
+
+def test_save_while_buffer_busy_writes_full_session():
+    state = _session(20)
+    assert fl._BUF_LOCK.acquire(blocking=False)     # an earlier write still holds _BUF
+    try:
+        assert _save(state) == _expected(state)
+    finally:
+        fl._BUF_LOCK.release()
+
+def test_failed_write_reported_and_lock_released(monkeypatch):
+    reported = []
+    def fail_open(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(fl.os, "open", fail_open)
+    monkeypatch.setattr(fl, "_report", lambda err, window, from_thread=False: reported.append((err, from_thread)))
+
+    assert fl.save_log(_session(2)) is not None
+    fl.wait_pending()
+    assert [(str(err), from_thread) for err, from_thread in reported] == [("disk full", True)]
+    assert fl._BUF_LOCK.acquire(blocking=False)
+    fl._BUF_LOCK.release()
@@ -0,0 +1,149 @@
+# Checks the nowcast engine: rule verdicts, the trend window and its column store
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import nowcast_minimal as nc
+from nowcast_minimal import EngineConfig, NowcastEngine, adjust_pressure_to_reference_hpa
+
+H3 = 3 * 3600
+
+def _engine(samples, **kw):
+    """Engine fed with (T_C, Td_C, H_m, P_hpa, t_s) tuples."""
+    eng = NowcastEngine(**kw)
+    for T, Td, H, P, t in samples:
+        eng.add_sample(T_C=T, Td_C=Td, RH_pct=70.0, H_m=H, P_hpa=P, t_s=t)
+    return eng
+
+
+# Two samples 3 h apart at one altitude; expected (verdict, eta_hours)
+CASES = {
+    # P -3.3 hPa/h and Δ = 4.0 °C: 125 * 4.0 = 500 m hits the inclusive LCL threshold
+    "strong_lcl_low": ([(15.0, 5.0, 2000.0, 790.0, 0), (-4.6, -8.6, 2000.0, 780.0, H3)],
+                       ("Worse", (1, 6))),
+    "strong_td_rising": ([(20.0, 5.0, 2000.0, 790.0, 0), (22.0, 7.0, 2000.0, 785.0, H3)],
+                         ("Worse", (1, 6))),
+    "moderate_drop": ([(20.0, 5.0, 2000.0, 790.0, 0), (20.0, 4.0, 2000.0, 785.0, H3)],
+                      ("Worse", (3, 12))),
+    "moderate_moistening": ([(20.0, 10.0, 2000.0, 790.0, 0), (20.0, 12.0, 2000.0, 789.0, H3)],
+                            ("Worse", (3, 12))),
+    "better": ([(15.0, 5.0, 2000.0, 780.0, 0), (22.0, 4.0, 2000.0, 782.0, H3)],
+               ("Better", (3, 12))),
+    "stable": ([(15.0, 5.0, 2000.0, 780.0, 0), (15.0, 5.0, 2000.0, 780.0, H3)],
+               ("Stable", (6, 12))),
+    "single_sample": ([(15.0, 5.0, 2000.0, 780.0, 0)],
+                      ("Stable", (6, 12))),
+}
+
+@pytest.mark.parametrize("verbose", [False, True])
+@pytest.mark.parametrize("name", CASES)
+def test_verdicts(name, verbose):
+    samples, expected = CASES[name]
+    res = _engine(samples, verbose=verbose).evaluate()
+    assert (res.verdict, res.eta_hours) == expected
+
+def test_empty_engine():
+    res = NowcastEngine().evaluate()
+    assert (res.verdict, res.eta_hours) == ("Stable", (6, 12))
+    assert res.details == {"note": "No samples yet."}
+
+def test_details_only_when_verbose():
+    samples = CASES["strong_lcl_low"][0]
+    assert _engine(samples).evaluate().details == {}
+    details = _engine(samples, verbose=True).evaluate().details
+    assert set(details) == {"trends", "LCL", "rule_flags", "current"}
+    # verbose keeps the full moisture trend even when pressure alone decides
+    assert "dTd_C_per_h" in details["trends"]
+    assert None not in details["rule_flags"].values()
+    assert details["rule_flags"]["lcl_low_now"] is True
+    assert details["current"]["T_C"] == -4.6          # stored as given, no float32 rounding
+    assert details["trends"]["hours"] == pytest.approx(3.0)
+    assert details["trends"]["dP_hpa"] == pytest.approx(-10.0)
+
+def test_reference_pressure_cached_per_sample():
+    samples = [(15.0, 5.0, 2000.0, 780.0, 0), (14.0, 5.0, 2300.0, 755.0, 600),
+               (13.0, 5.0, 1800.0, 800.0, 1200)]
+    eng = _engine(samples)
+    assert eng.H_ref_m == 2000.0                       # first sample's altitude
+    assert list(eng._P_ref_hpa) == [adjust_pressure_to_reference_hpa(P, H, 2000.0)
+                                    for _, _, H, P, _ in samples]
+    assert list(_engine(samples, H_ref_m=1500.0)._P_ref_hpa) == [
+        adjust_pressure_to_reference_hpa(P, H, 1500.0) for _, _, H, P, _ in samples]
+
+def test_pressure_vec_matches_scalar():
+    P, H = [780.0, 755.0, 800.0, 1013.25], [2000.0, 2300.0, 1800.0, 0.0]
+    assert list(nc.adjust_pressure_to_reference_hpa_vec(P, H, 1500.0)) == pytest.approx(
+        [adjust_pressure_to_reference_hpa(p, h, 1500.0) for p, h in zip(P, H)], rel=1e-12)
+    with pytest.raises(ValueError):
+        nc.adjust_pressure_to_reference_hpa_vec(P, H[:-1], 1500.0)
+
+def test_nan_altitude_propagates():
+    nan = float("nan")
+    assert math.isnan(adjust_pressure_to_reference_hpa(780.0, nan, 1500.0))
+    assert math.isnan(nc.pressure_at_altitude_pa(101325.0, nan))
+    assert math.isnan(nc.adjust_pressure_to_reference_hpa_vec([780.0], [nan], 1500.0)[0])
+    eng = _engine([(15.0, 5.0, 2000.0, 780.0, 0), (15.0, 5.0, nan, 770.0, H3)])
+    assert math.isnan(eng._P_ref_hpa[1])
+    res = eng.evaluate()
+    assert (res.verdict, res.eta_hours) == ("Stable", (6, 12))
+
+def test_window_trimmed_on_evaluate():
+    # one sample every 10 min for 5 h; the window keeps the last 3 h (inclusive)
+    eng = _engine([(15.0, 5.0, 2000.0, 780.0, 600 * i) for i in range(31)])
+    assert eng._lo == 0                                # add_sample() doesn't trim
+    eng.evaluate()
+    times = [s.t_s for s in eng.samples]
+    assert times == [600.0 * i for i in range(12, 31)]
+
+    # non-integer seconds: 14.1 - 10 = 4.1 exactly on the (inclusive) boundary
+    samples = CASES["strong_lcl_low"][0]
+    eng = _engine([s[:4] + (t,) for s, t in zip(samples, (4.1, 14.1))],
+                  config=EngineConfig(trend_window_s=10))
+    assert eng.evaluate().verdict == "Worse"
+    assert [s.t_s for s in eng.samples] == [4.1, 14.1]
+
+@pytest.mark.parametrize("verbose", [False, True])
+def test_window_same_for_any_evaluate_cadence(verbose):
+    every, sparse = NowcastEngine(verbose=verbose), NowcastEngine(verbose=verbose)
+    P = 790.0
+    for i in range(400):
+        P -= 0.05 if (i // 50) % 2 else -0.03
+        kw = dict(T_C=12.0 + (i % 7) * 0.1, Td_C=8.0, RH_pct=80.0, H_m=2000.0, P_hpa=P, t_s=120.0 * i)
+        every.add_sample(**kw)
+        sparse.add_sample(**kw)
+        res = every.evaluate()
+        if i % 17 == 0:
+            other = sparse.evaluate()
+            assert (res.verdict, res.eta_hours, res.details) == (other.verdict, other.eta_hours, other.details)
+            assert every.samples == sparse.samples
+
+def test_compaction_boundary():
+    # window of 10 s, one sample per second: 11 samples stay live
+    cfg = EngineConfig(trend_window_s=10)
+    n = nc._COMPACT_MIN + 11 - 1
+    eng = _engine([(15.0, 5.0, 2000.0, 780.0, i) for i in range(n)], config=cfg)
+    eng.evaluate()
+    assert eng._lo == nc._COMPACT_MIN - 1              # just below the minimum: rows kept
+    assert len(eng._t_ns) == n
+    before = eng.samples
+
+    eng.add_sample(T_C=15.0, Td_C=5.0, RH_pct=70.0, H_m=2000.0, P_hpa=780.0, t_s=n)
+    eng.evaluate()
+    assert eng._lo == 0                                # _COMPACT_MIN expired rows: compacted
+    assert all(len(col) == 11 for col in (eng._t_ns, eng._T_C, eng._Td_C, eng._RH_pct, eng._H_m,
+                                           eng._P_hpa, eng._P_ref_hpa, eng._LCL_meas, eng._has_LCL))
+    assert eng.samples == before[1:] + [nc.Sample(float(n), 15.0, 5.0, 70.0, 2000.0, 780.0)]
+
+def test_measured_lcl_round_trips():
+    eng = NowcastEngine(verbose=True)
+    eng.add_sample(T_C=15.0, Td_C=5.0, RH_pct=70.0, H_m=2000.0, P_hpa=780.0, t_s=0)
+    eng.add_sample(T_C=15.0, Td_C=5.0, RH_pct=70.0, H_m=2000.0, P_hpa=780.0,
+                   LCL_meas_mAMSL=3100.0, t_s=600)
+    assert [s.LCL_meas_mAMSL for s in eng.samples] == [None, 3100.0]
+    lcl = eng.evaluate().details["LCL"]
+    assert lcl["estimated_mAMSL"] == 2000.0 + 125.0 * 10.0
+    assert lcl["estimate_minus_measured_m"] == pytest.approx(150.0)